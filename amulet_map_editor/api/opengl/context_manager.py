@@ -1,6 +1,8 @@
 class ContextManager:
     """Store the uuid of the context this data applies to."""
 
+    __slots__ = ("_context_identifier",)
+
     def __init__(self, context_identifier: str):
         self._context_identifier = context_identifier
 
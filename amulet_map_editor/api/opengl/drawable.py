@@ -1,6 +1,8 @@
 class Drawable:
     """A base class for all classes holding opengl data."""
 
+    __slots__ = ()
+
     def draw(self, *args, **kwargs):
         """Draw the opengl data."""
         raise NotImplementedError
@@ -56,3 +56,22 @@ def orthographic_matrix(
             [0, 0, 0, 1],
         ]
     )
+
+
+def frustum_planes(transformation_matrix: TransformationMatrixType) -> numpy.ndarray:
+    """Extract the six clipping planes from a transformation matrix (Gribb/Hartmann method).
+
+    :param transformation_matrix: The world to projection matrix.
+    :return: A (6, 4) array of planes (a, b, c, d). A point is inside a plane if a*x + b*y + c*z + d >= 0
+    """
+    matrix = numpy.asarray(transformation_matrix, dtype=numpy.float64)
+    return numpy.array(
+        [
+            matrix[3] + matrix[0],  # left
+            matrix[3] - matrix[0],  # right
+            matrix[3] + matrix[1],  # bottom
+            matrix[3] - matrix[1],  # top
+            matrix[3] + matrix[2],  # near
+            matrix[3] - matrix[2],  # far
+        ]
+    )
@@ -1 +1 @@
-from .chunk import RenderChunk
+from .chunk import RenderChunk, RegionVertexType
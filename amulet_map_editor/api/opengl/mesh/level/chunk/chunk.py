@@ -1,5 +1,5 @@
 import numpy
-from typing import TYPE_CHECKING, Tuple, List, Union
+from typing import TYPE_CHECKING, Tuple, List, Union, Optional
 import weakref
 import itertools
 from amulet_map_editor import log
@@ -16,6 +16,18 @@ from amulet_map_editor.api.opengl.resource_pack import OpenGLResourcePack
 if TYPE_CHECKING:
     from amulet.api.chunk import Chunk
 
+# The vertex format used in the region vertex buffers.
+# The texture bounds are kept as floats because the atlas is sampled with GL_NEAREST
+# and rounding them to a fixed point format moves the edges into neighbouring textures.
+RegionVertexType = numpy.dtype(
+    [
+        ("position", numpy.float32, (3,)),
+        ("texture_coords", numpy.float32, (2,)),
+        ("texture_bounds", numpy.float32, (4,)),
+        ("tint", numpy.float32, (3,)),
+    ]
+)
+
 
 class RenderChunk(RenderChunkBuilder):
     def __init__(
@@ -46,6 +58,13 @@ class RenderChunk(RenderChunkBuilder):
         self.verts_translucent = (
             0  # the offset into the above from which the faces can be translucent
         )
+        # the vertices in the format used by the region vertex buffers
+        self.region_verts: numpy.ndarray = numpy.zeros(0, RegionVertexType)
+        # the number of vertices at the start of region_verts that are opaque. The rest can be translucent.
+        # This is set with region_verts so the two always match.
+        self.region_opaque_count = 0
+        # the (min, max) corners of the geometry relative to the region or None if there is no geometry
+        self.geometry_bounds: Optional[numpy.ndarray] = None
         # self.chunk_lod1: numpy.ndarray = self.new_empty_verts()
 
     def __repr__(self):
@@ -194,8 +213,27 @@ class RenderChunk(RenderChunkBuilder):
                 )
                 self.verts = numpy.concatenate([self.verts, plane.ravel()], 0)
                 self.draw_count += len(plane)
+        self._create_region_verts()
         self._needs_rebuild = True
 
+    def _create_region_verts(self):
+        """Create the structured vertex array used by the region vertex buffers.
+        The layouts match so this is a view of the float vertices rather than a copy."""
+        verts = numpy.ascontiguousarray(self.verts, dtype=numpy.float32)
+        self.region_verts = verts.view(RegionVertexType)
+        self.region_opaque_count = min(
+            self.verts_translucent // self._vert_len, self.region_verts.size
+        )
+        if self.region_verts.size:
+            positions = self.region_verts["position"]
+            self.geometry_bounds = numpy.array(
+                [positions.min(axis=0), positions.max(axis=0)]
+            )
+        else:
+            self.geometry_bounds = None
+        # The chunk is only drawn through its region so only region_verts needs to reference the data.
+        self.verts = self.new_empty_verts()
+
     def _create_empty_geometry(self):
         if self._draw_floor:
             plane = self._create_grid(
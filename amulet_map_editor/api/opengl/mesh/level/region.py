@@ -1,46 +1,96 @@
 from OpenGL.GL import (
     GL_DYNAMIC_DRAW,
-    glBindVertexArray,
     glBindBuffer,
     GL_ARRAY_BUFFER,
     glBufferSubData,
+    glBufferData,
+    glMultiDrawArrays,
+    glVertexAttribPointer,
+    glEnableVertexAttribArray,
+    GL_FLOAT,
+    GL_FALSE,
 )
-from typing import Dict, Tuple, Optional
+from typing import Dict, Tuple, Optional, List, Set
 import numpy
-import queue
-from .chunk import RenderChunk
+import threading
+import bisect
+import ctypes
+import time
+from .chunk import RenderChunk, RegionVertexType
 from amulet_map_editor.api.opengl.mesh.tri_mesh import TriMesh
 from amulet_map_editor.api.opengl.resource_pack import OpenGLResourcePack
-from amulet_map_editor.api.opengl.matrix import displacement_matrix
+from amulet_map_editor.api.opengl.matrix import frustum_planes
 from amulet_map_editor.api.opengl.data_types import TransformationMatrix
 
 
 class ChunkManager:
+    __slots__ = (
+        "context_identifier",
+        "_resource_pack",
+        "region_size",
+        "merge_time_budget",
+        "_region_shift",
+        "_regions",
+        "_chunk_temp",
+        "_chunk_temp_lock",
+        "_rebuild_regions",
+        "_region_list",
+        "_region_coords_array",
+        "_region_origins",
+        "_region_bounds",
+        "_region_indexes",
+        "_regions_changed",
+        "_grown_regions",
+    )
+
     def __init__(
         self, context_identifier: str, resource_pack: OpenGLResourcePack, region_size=16
     ):
         self.context_identifier = context_identifier
         self._resource_pack = resource_pack
         self.region_size = region_size
+        # The time in seconds each frame that can be spent writing new chunks to the region buffers.
+        # At least one region is merged every frame even if it takes longer than this.
+        self.merge_time_budget = 0.002
+        if region_size > 0 and not region_size & (region_size - 1):
+            # region_size is a power of two so the region coordinates can be found by bit shifting
+            self._region_shift: Optional[int] = region_size.bit_length() - 1
+        else:
+            self._region_shift = None
         self._regions: Dict[Tuple[int, int], RenderRegion] = {}
         # added chunks are put in here and then processed on the next call of draw
         # This is because add_render_chunk can be called from a different thread to draw
         # which causes issues due to dictionaries resizing
-        self._chunk_temp: queue.Queue = queue.Queue()
-        self._chunk_temp_set = set()
+        # If a chunk is added again before it has been processed only the newest one is kept.
+        # The lock is only held briefly so the render thread is never kept waiting.
+        self._chunk_temp: Dict[Tuple[int, int], RenderChunk] = {}
+        self._chunk_temp_lock = threading.Lock()
         self._rebuild_regions = []
 
+        # The regions as a list along with their coordinates, origins and bounds stacked into arrays.
+        # This lets draw sort, cull and transform the regions by the camera in one numpy call each.
+        # These are recreated when _regions_changed is set.
+        self._region_list: List[RenderRegion] = []
+        self._region_coords_array = numpy.zeros((0, 2), dtype=numpy.int64)
+        self._region_origins = numpy.zeros((0, 3), dtype=numpy.float64)
+        self._region_bounds = numpy.zeros((0, 2, 3), dtype=numpy.float64)
+        # The index of each region in _region_list.
+        self._region_indexes: Dict[Tuple[int, int], int] = {}
+        self._regions_changed = False
+        # Regions that have had chunks added so their bounds may be larger than in _region_bounds.
+        self._grown_regions: Set[RenderRegion] = set()
+
     def add_render_chunk(self, render_chunk: RenderChunk):
         """Add a RenderChunk to the database.
         A call to _merge_chunk_temp from the main thread will be needed for them to be drawn.
         This is done after the next draw call."""
-        self._chunk_temp.put(render_chunk)
         chunk_coords = (render_chunk.cx, render_chunk.cz)
-        self._chunk_temp_set.add(chunk_coords)
+        with self._chunk_temp_lock:
+            self._chunk_temp[chunk_coords] = render_chunk
 
     def render_chunk_needs_rebuild(self, chunk_coords: Tuple[int, int]) -> bool:
         return (
-            chunk_coords not in self._chunk_temp_set
+            chunk_coords not in self._chunk_temp
             and self.render_chunk_in_main_database(chunk_coords)
             and self.get_render_chunk(chunk_coords).needs_rebuild()
         )
@@ -53,9 +103,11 @@ class ChunkManager:
         )
 
     def _merge_chunk_temp(self):
-        for _ in range(self._chunk_temp.qsize()):
-            render_chunk = self._chunk_temp.get()
-            region_coords = self.region_coords(render_chunk.cx, render_chunk.cz)
+        with self._chunk_temp_lock:
+            chunk_temp = list(self._chunk_temp.values())
+        region_coords_ = self.region_coords
+        for render_chunk in chunk_temp:
+            region_coords = region_coords_(render_chunk.cx, render_chunk.cz)
             if region_coords not in self._regions:
                 self._regions[region_coords] = RenderRegion(
                     region_coords[0],
@@ -64,13 +116,21 @@ class ChunkManager:
                     self.context_identifier,
                     self._resource_pack,
                 )
-            self._regions[region_coords].add_render_chunk(render_chunk)
-        self._chunk_temp_set.clear()
+                self._regions_changed = True
+            region = self._regions[region_coords]
+            region.add_render_chunk(render_chunk)
+            self._grown_regions.add(region)
+        with self._chunk_temp_lock:
+            # the chunks stay in _chunk_temp until they are in a region so they are always found by __contains__
+            # chunks replaced while merging are still pending
+            for render_chunk in chunk_temp:
+                chunk_coords = render_chunk.coords
+                if self._chunk_temp.get(chunk_coords) is render_chunk:
+                    del self._chunk_temp[chunk_coords]
 
     def __contains__(self, chunk_coords: Tuple[int, int]):
-        return (
-            chunk_coords in self._chunk_temp_set
-            or self.render_chunk_in_main_database(chunk_coords)
+        return chunk_coords in self._chunk_temp or self.render_chunk_in_main_database(
+            chunk_coords
         )
 
     def render_chunk_in_main_database(self, chunk_coords: Tuple[int, int]) -> bool:
@@ -81,29 +141,112 @@ class ChunkManager:
         )
 
     def region_coords(self, cx, cz):
-        return cx // self.region_size, cz // self.region_size
+        shift = self._region_shift
+        if shift is None:
+            return cx // self.region_size, cz // self.region_size
+        return cx >> shift, cz >> shift
+
+    def _merge_regions(self, regions: List["RenderRegion"]):
+        """Write new chunk geometry into the region buffers in the order given.
+        This stops once merge_time_budget has been used so that a large number of new chunks does not cause a long frame.
+        The remaining regions are merged on later frames."""
+        end_time = time.perf_counter() + self.merge_time_budget
+        for region in regions:
+            if region.needs_merge:
+                region.merge()
+                if time.perf_counter() > end_time:
+                    break
+
+    def _update_region_arrays(self):
+        """Recreate the region list and arrays if regions have been added or removed.
+        Otherwise only update the bounds of the regions that chunks have been added to.
+        """
+        if self._regions_changed:
+            self._regions_changed = False
+            self._grown_regions.clear()
+            self._region_list = list(self._regions.values())
+            self._region_indexes = {
+                (region.rx, region.rz): index
+                for index, region in enumerate(self._region_list)
+            }
+            self._region_coords_array = numpy.array(
+                [(region.rx, region.rz) for region in self._region_list],
+                dtype=numpy.int64,
+            ).reshape((-1, 2))
+            self._region_origins = numpy.array(
+                [region.origin for region in self._region_list],
+                dtype=numpy.float64,
+            ).reshape((-1, 3))
+            self._region_bounds = numpy.array(
+                [region.bounds for region in self._region_list],
+                dtype=numpy.float64,
+            ).reshape((-1, 2, 3))
+        elif self._grown_regions:
+            for region in self._grown_regions:
+                self._region_bounds[self._region_indexes[(region.rx, region.rz)]] = (
+                    region.bounds
+                )
+            self._grown_regions.clear()
 
-    def draw(self, camera_matrix: TransformationMatrix, camera):
-        cam_rx, cam_rz = numpy.floor(
-            numpy.array(camera)[[0, 2]] / (16 * self.region_size)
+    def _regions_in_frustum(self, camera_matrix: TransformationMatrix) -> numpy.ndarray:
+        """Find which regions in _region_list have geometry that may be visible to the camera.
+
+        :param camera_matrix: The world to projection matrix.
+        :return: A bool array with one entry per region.
+        """
+        planes = frustum_planes(camera_matrix)
+        # (region, min/max, xyz)
+        bounds = self._region_bounds
+        # the corner of each box furthest along the normal of each plane (region, plane, xyz)
+        corners = numpy.where(
+            planes[None, :, :3] >= 0, bounds[:, None, 1, :], bounds[:, None, 0, :]
         )
-        cam_cx, cam_cz = numpy.floor(numpy.array(camera)[[0, 2]] / 16)
-        for region in sorted(
-            self._regions.values(),
-            key=lambda x: abs(x.rx - cam_rx) + abs(x.rz - cam_rz),
-            reverse=True,
-        ):
-            region.draw(camera_matrix, cam_cx, cam_cz)
+        distances = numpy.einsum("rpi,pi->rp", corners, planes[:, :3]) + planes[:, 3]
+        # a region is visible if that corner is inside every plane
+        return numpy.all(distances >= 0, axis=1)
+
+    def draw(self, camera_matrix: TransformationMatrix, camera):
+        self._update_region_arrays()
+        if self._region_list:
+            cam_region = numpy.floor(
+                numpy.array(camera)[[0, 2]] / (16 * self.region_size)
+            )
+            # region indexes from closest to furthest
+            order = numpy.argsort(
+                numpy.abs(self._region_coords_array - cam_region).sum(axis=1),
+                kind="stable",
+            )
+            region_list = self._region_list
+            # merge the closest regions first
+            self._merge_regions([region_list[index] for index in order])
+            visible = self._regions_in_frustum(camera_matrix)
+            # The region transforms are only translations so multiplying the camera matrix by them
+            # only changes the last column. This is done in float64 to keep precision far from the origin.
+            camera_matrix = numpy.asarray(camera_matrix, dtype=numpy.float64)
+            transformation_matrices = numpy.repeat(
+                camera_matrix[None], len(region_list), axis=0
+            )
+            transformation_matrices[:, :, 3] += numpy.matmul(
+                self._region_origins, camera_matrix[:, :3].T
+            )
+            RenderRegion.draw_regions(
+                [
+                    (region_list[index], transformation_matrices[index])
+                    for index in order[::-1]
+                    if visible[index]
+                ]
+            )
         self._merge_chunk_temp()
 
     def unload(self, safe_area: Tuple[int, int, int, int] = None):
         if safe_area is None:
-            for _ in range(self._chunk_temp.qsize()):
-                self._chunk_temp.get()
-            self._chunk_temp_set.clear()
+            with self._chunk_temp_lock:
+                self._chunk_temp = {}
             for region in self._regions.values():
                 region.unload()
             self._regions.clear()
+            self._regions_changed = True
+            RenderRegion.release_scratch_verts()
         else:
             min_rx, min_rz = self.region_coords(*safe_area[:2])
             max_rx, max_rz = self.region_coords(*safe_area[2:])
@@ -117,6 +260,8 @@ class ChunkManager:
 
             for region in delete_regions:
                 del self._regions[region]
+            if delete_regions:
+                self._regions_changed = True
 
     def rebuild(self):
         """Rebuild a single region which was last rebuild the longest ago.
@@ -130,12 +275,60 @@ class ChunkManager:
                 self._regions[region].rebuild()
 
 
+# The offset and size of the opaque and translucent geometry of each chunk in the vertex buffer.
+# All values are in vertices.
 MergedChunkLocationsType = Dict[Tuple[int, int], Tuple[int, int, int, int]]
 
 
 class RenderRegion(TriMesh):
+    __slots__ = (
+        "rx",
+        "rz",
+        "_chunks",
+        "_merged_chunk_locations",
+        "_unmerged_chunks",
+        "_vbo_capacity",
+        "_vbo_used",
+        "_free_ranges",
+        "_draw_firsts",
+        "_draw_counts",
+        "_temp_data",
+        "_origin",
+        "bounds",
+        "_has_bounds",
+    )
+
+    # The arguments to glVertexAttribPointer for each attribute in RegionVertexType.
+    # The layout never changes so these are only worked out once rather than for every region.
+    _region_vertex_attrs = tuple(
+        (
+            index,
+            RegionVertexType.fields[name][0].shape[0],
+            attr_type,
+            normalised,
+            RegionVertexType.itemsize,
+            ctypes.c_void_p(RegionVertexType.fields[name][1]),
+        )
+        for index, (name, attr_type, normalised) in enumerate(
+            (
+                ("position", GL_FLOAT, GL_FALSE),
+                ("texture_coords", GL_FLOAT, GL_FALSE),
+                ("texture_bounds", GL_FLOAT, GL_FALSE),
+                ("tint", GL_FLOAT, GL_FALSE),
+            )
+        )
+    )
+
+    # A reusable array that geometry is packed into before being uploaded to OpenGL.
+    # This is shared between all regions and must only be used from the main thread.
+    _scratch_verts = numpy.zeros(0, dtype=RegionVertexType)
+
     _merged_chunk_locations: MergedChunkLocationsType
-    _temp_data: Optional[Tuple[numpy.ndarray, MergedChunkLocationsType]]
+    _temp_data: Optional[
+        Tuple[
+            numpy.ndarray, MergedChunkLocationsType, Dict[Tuple[int, int], RenderChunk]
+        ]
+    ]
 
     def __init__(
         self,
@@ -153,40 +346,101 @@ class RenderRegion(TriMesh):
         self.rz = rz
         self._chunks: Dict[Tuple[int, int], RenderChunk] = {}
         self._merged_chunk_locations: MergedChunkLocationsType = {}
-        self._manual_chunks: Dict[Tuple[int, int], RenderChunk] = {}
-
-        # Merging is done on a new thread which can't modify the opengl state.
+        # The locations of chunks that have been added but not yet written to the vertex buffer.
+        # If a chunk was replaced the old geometry in _merged_chunk_locations is drawn until merge writes the new chunk.
+        self._unmerged_chunks: Set[Tuple[int, int]] = set()
+
+        # The number of bytes allocated in the vertex buffer.
+        # This can be larger than the data currently in it so that it does not need to be reallocated every merge.
+        self._vbo_capacity = 0
+        # The number of vertices from the start of the buffer that have been handed out.
+        self._vbo_used = 0
+        # (offset, size) ranges in vertices below _vbo_used that are no longer used by any chunk.
+        # These are sorted by offset and neighbouring ranges are joined. See _free_range.
+        self._free_ranges: List[Tuple[int, int]] = []
+
+        # The first vertex and vertex count of each range in the buffer that should be drawn.
+        self._draw_firsts = numpy.zeros(0, dtype=numpy.int32)
+        self._draw_counts = numpy.zeros(0, dtype=numpy.int32)
+
+        # Repacking is done on a new thread which can't modify the opengl state.
         # This stores the created data and the main thread loads it when drawing.
         self._temp_data = None
 
-        self.region_transform = displacement_matrix(
-            rx * region_size * 16, 0, rz * region_size * 16
+        self._origin = numpy.array(
+            [rx * region_size * 16, 0, rz * region_size * 16], dtype=numpy.float64
         )
+        # The (min, max) corners in world space of the geometry of every chunk added to the region.
+        # This only ever grows until the region is unloaded.
+        self.bounds = numpy.array([self._origin, self._origin])
+        self._has_bounds = False
+
+    @staticmethod
+    def new_empty_verts() -> numpy.ndarray:
+        return numpy.zeros(0, dtype=RegionVertexType)
 
     @property
     def vertex_usage(self):
         return GL_DYNAMIC_DRAW
 
+    def _setup_opengl_attrs(self):
+        """Set up OpenGL vertex attributes for RegionVertexType"""
+        for args in self._region_vertex_attrs:
+            glVertexAttribPointer(*args)
+            glEnableVertexAttribArray(args[0])
+
     def __repr__(self):
         return f"RenderRegion({self.rx}, {self.rz})"
 
+    @classmethod
+    def _get_scratch_verts(cls, size: int) -> numpy.ndarray:
+        """Get an uninitialised vertex array of the given size backed by the shared scratch array.
+        The array is only valid until the next call so must be uploaded before then.
+        This must only be called from the main thread."""
+        if size > cls._scratch_verts.size:
+            cls._scratch_verts = numpy.empty(size, dtype=RegionVertexType)
+        return cls._scratch_verts[:size]
+
+    @classmethod
+    def release_scratch_verts(cls):
+        """Free the shared scratch array. It is created again when next needed."""
+        cls._scratch_verts = numpy.zeros(0, dtype=RegionVertexType)
+
+    @property
+    def origin(self) -> numpy.ndarray:
+        """The world location of the region. All geometry in the region is relative to this."""
+        return self._origin
+
     def __contains__(self, item):
         return item in self._chunks
 
     def add_render_chunk(self, render_chunk: RenderChunk):
-        """Add a chunk to the region"""
+        """Add a chunk to the region.
+        The geometry is written to the vertex buffer on the next merge."""
         chunk_coords = (render_chunk.cx, render_chunk.cz)
         if chunk_coords in self._chunks:
             self._chunks[chunk_coords].unload()
-        self._disable_merged_chunk(chunk_coords)
         self._chunks[chunk_coords] = render_chunk
-        self._manual_chunks[chunk_coords] = render_chunk
+        self._unmerged_chunks.add(chunk_coords)
+        if render_chunk.geometry_bounds is not None:
+            chunk_bounds = render_chunk.geometry_bounds + self._origin
+            if self._has_bounds:
+                self.bounds = numpy.array(
+                    [
+                        numpy.minimum(self.bounds[0], chunk_bounds[0]),
+                        numpy.maximum(self.bounds[1], chunk_bounds[1]),
+                    ]
+                )
+            else:
+                self.bounds = chunk_bounds
+                self._has_bounds = True
 
     def get_render_chunk(self, chunk_coords: Tuple[int, int]):
         return self._chunks[chunk_coords]
 
-    def _disable_merged_chunk(self, chunk_coords: Tuple[int, int]):
-        """Zero out the region of memory in the merged chunks related to a given chunk"""
+    def _free_merged_chunk(self, chunk_coords: Tuple[int, int]):
+        """Allow the space the geometry of a chunk uses in the vertex buffer to be reused.
+        _update_draw_ranges must be called after this to stop drawing it."""
         if chunk_coords in self._merged_chunk_locations:
             (
                 offset,
@@ -194,89 +448,319 @@ class RenderRegion(TriMesh):
                 translucent_offset,
                 translucent_size,
             ) = self._merged_chunk_locations.pop(chunk_coords)
-            glBindVertexArray(self._vao)
-            glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
-            glBufferSubData(
-                GL_ARRAY_BUFFER,
-                offset * 4,
-                size * 4,
-                numpy.zeros(size, dtype=numpy.float32),
-            )
-            glBufferSubData(
-                GL_ARRAY_BUFFER,
-                translucent_offset * 4,
-                translucent_size * 4,
-                numpy.zeros(translucent_size, dtype=numpy.float32),
+            if offset + size == translucent_offset:
+                # chunks written by merge have their translucent geometry straight after the opaque geometry
+                self._free_range(offset, size + translucent_size)
+            else:
+                self._free_range(offset, size)
+                self._free_range(translucent_offset, translucent_size)
+
+    def _free_range(self, offset: int, size: int):
+        """Mark a range of the vertex buffer as unused.
+        The range is joined with any free ranges next to it so that a larger chunk can fit in the space.
+        If it ends at _vbo_used it is returned to the unallocated space at the end of the buffer.
+
+        :param offset: The vertex offset of the range.
+        :param size: The number of vertices in the range.
+        """
+        if not size:
+            return
+        index = bisect.bisect_left(self._free_ranges, (offset, size))
+        if (
+            index < len(self._free_ranges)
+            and offset + size == self._free_ranges[index][0]
+        ):
+            size += self._free_ranges.pop(index)[1]
+        if index and sum(self._free_ranges[index - 1]) == offset:
+            index -= 1
+            offset, previous_size = self._free_ranges.pop(index)
+            size += previous_size
+        if offset + size == self._vbo_used:
+            self._vbo_used = offset
+        else:
+            self._free_ranges.insert(index, (offset, size))
+
+    def _allocate(self, size: int) -> Optional[int]:
+        """Find space for a number of vertices in the vertex buffer.
+
+        :param size: The number of vertices to find space for.
+        :return: The vertex offset of the space or None if it does not fit in the buffer.
+        """
+        for index, (offset, free_size) in enumerate(self._free_ranges):
+            if free_size >= size:
+                if free_size == size:
+                    del self._free_ranges[index]
+                else:
+                    self._free_ranges[index] = (offset + size, free_size - size)
+                return offset
+        if (self._vbo_used + size) * RegionVertexType.itemsize <= self._vbo_capacity:
+            offset = self._vbo_used
+            self._vbo_used += size
+            return offset
+        return None
+
+    def _change_verts(self, verts=None):
+        """Modify the vertices in OpenGL. Requires binding and unbinding.
+        The buffer storage is only reallocated when the new data does not fit in it."""
+        if verts is None:
+            verts = self.verts
+        if verts.nbytes > self._vbo_capacity:
+            # grow the buffer geometrically so that a region that is being filled is not reallocated every merge
+            self._vbo_capacity = max(verts.nbytes, self._vbo_capacity * 2)
+            glBufferData(GL_ARRAY_BUFFER, self._vbo_capacity, None, self.vertex_usage)
+        if verts.nbytes:
+            glBufferSubData(GL_ARRAY_BUFFER, 0, verts.nbytes, verts)
+
+    @staticmethod
+    def _coalesce_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Sort (offset, size) ranges and join the ranges that are next to each other in the buffer."""
+        coalesced = []
+        for offset, size in sorted(ranges):
+            if coalesced and sum(coalesced[-1]) == offset:
+                coalesced[-1] = (coalesced[-1][0], coalesced[-1][1] + size)
+            else:
+                coalesced.append((offset, size))
+        return coalesced
+
+    def _update_draw_ranges(self):
+        """Rebuild the arrays of ranges passed to glMultiDrawArrays.
+        All opaque geometry is drawn before the translucent geometry.
+        Neighbouring chunks are joined into one range so a packed region only needs two.
+        """
+        locations = self._merged_chunk_locations.values()
+        ranges = self._coalesce_ranges(
+            [(offset, size) for offset, size, _, _ in locations if size]
+        ) + self._coalesce_ranges(
+            [(offset, size) for _, _, offset, size in locations if size]
+        )
+        if ranges:
+            ranges = numpy.array(ranges, dtype=numpy.int32)
+            self._draw_firsts = numpy.ascontiguousarray(ranges[:, 0])
+            self._draw_counts = numpy.ascontiguousarray(ranges[:, 1])
+        else:
+            self._draw_firsts = numpy.zeros(0, dtype=numpy.int32)
+            self._draw_counts = numpy.zeros(0, dtype=numpy.int32)
+
+    def _pack_chunks(
+        self, chunks: Dict[Tuple[int, int], RenderChunk], use_scratch: bool = False
+    ) -> Tuple[numpy.ndarray, MergedChunkLocationsType]:
+        """Merge the geometry of the given chunks into one array.
+        The opaque geometry of every chunk comes first followed by the translucent geometry.
+
+        :param chunks: The chunks to merge.
+        :param use_scratch: Pack into the shared scratch array rather than a new array.
+            Only use this from the main thread when the result is uploaded straight away.
+        :return: The merged vertices and the location of each chunk in them.
+        """
+        chunk_sizes = [
+            (chunk_location, chunk, chunk.region_opaque_count)
+            for chunk_location, chunk in chunks.items()
+        ]
+        offset = 0
+        translucent_offset = sum(size for _, _, size in chunk_sizes)
+        merged_locations: MergedChunkLocationsType = {}
+        for chunk_location, chunk, size in chunk_sizes:
+            translucent_size = chunk.region_verts.size - size
+            merged_locations[chunk_location] = (
+                offset,
+                size,
+                translucent_offset,
+                translucent_size,
             )
-            glBindVertexArray(0)
-            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            offset += size
+            translucent_offset += translucent_size
 
-    def rebuild(self):
-        """Merges chunk geometry for the region into one large array.
-        As each chunk is added it is drawn individually.
-        After not too long the individual draw calls for each chunk will reach the bottleneck for python.
-        To solve this we take the geometry for each chunk and merge them into one large array that only requires one draw call.
+        # write each chunk directly to its location rather than making a list of slices to concatenate
+        if use_scratch:
+            verts = self._get_scratch_verts(translucent_offset)
+        else:
+            verts = numpy.empty(translucent_offset, dtype=RegionVertexType)
+        for chunk_location, chunk, size in chunk_sizes:
+            offset, _, translucent_offset, translucent_size = merged_locations[
+                chunk_location
+            ]
+            verts[offset : offset + size] = chunk.region_verts[:size]
+            verts[translucent_offset : translucent_offset + translucent_size] = (
+                chunk.region_verts[size:]
+            )
+        return verts, merged_locations
 
-        :return:
+    def _load_packed(
+        self,
+        verts: numpy.ndarray,
+        merged_locations: MergedChunkLocationsType,
+        chunks: Dict[Tuple[int, int], RenderChunk],
+        spare_capacity: bool = False,
+    ):
+        """Replace the contents of the vertex buffer with packed chunk data.
+
+        :param verts: The packed vertices created by _pack_chunks.
+        :param merged_locations: The location of each chunk in verts.
+        :param chunks: The chunks that were packed.
+            Any chunk that has been replaced since is drawn until the new chunk is merged.
+        :param spare_capacity: Make sure the buffer is at least twice the size of verts.
+            This leaves room for chunks to be replaced without packing the region again.
         """
-        if self._manual_chunks:
-            region_verts = []
-            region_verts_translucent = []
-            merged_locations: MergedChunkLocationsType = {}
-            offset = 0
-            translucent_offset = 0
-            for chunk_location, chunk in self._chunks.items():
-                region_verts.append(chunk.verts[: chunk.verts_translucent])
-                region_verts_translucent.append(chunk.verts[chunk.verts_translucent :])
-                merged_locations[chunk_location] = [
-                    offset,
-                    chunk.verts_translucent,
-                    translucent_offset,
-                    chunk.verts.size - chunk.verts_translucent,
-                ]
-                offset += chunk.verts_translucent
-                translucent_offset += chunk.verts.size - chunk.verts_translucent
+        self._setup()
+        if spare_capacity and self._vbo_capacity < 2 * verts.nbytes:
+            self._vbo_capacity = 2 * verts.nbytes
+            glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+            glBufferData(GL_ARRAY_BUFFER, self._vbo_capacity, None, self.vertex_usage)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.change_verts(verts)
+        self._vbo_used = verts.size
+        self._free_ranges = []
+        self._merged_chunk_locations = {}
+        for chunk_location, location in merged_locations.items():
+            if chunk_location in self._chunks:
+                self._merged_chunk_locations[chunk_location] = location
+            else:
+                offset, size, translucent_offset, translucent_size = location
+                self._free_range(offset, size)
+                self._free_range(translucent_offset, translucent_size)
+        # chunks added or replaced since the data was packed still need merging
+        self._unmerged_chunks = {
+            chunk_location
+            for chunk_location, chunk in self._chunks.items()
+            if chunks.get(chunk_location) is not chunk
+        }
+        self._update_draw_ranges()
 
-            for val in merged_locations.values():
-                val[2] += offset
+    @property
+    def needs_merge(self) -> bool:
+        """Is there geometry waiting to be loaded into opengl."""
+        return bool(self._unmerged_chunks) or self._temp_data is not None
 
-            region_verts += region_verts_translucent
+    def _write_chunks(self, chunks: List[Tuple[int, RenderChunk]]):
+        """Write chunk geometry into the vertex buffer.
+        Chunks that are next to each other in the buffer are joined and written with one call.
 
-            if region_verts:
-                verts = numpy.concatenate(region_verts)
+        :param chunks: A list of vertex offsets and the chunk to write at that offset.
+        """
+        chunks.sort(key=lambda chunk_offset: chunk_offset[0])
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        start = 0
+        while start < len(chunks):
+            offset = chunks[start][0]
+            end_offset = offset + chunks[start][1].region_verts.size
+            end = start + 1
+            while end < len(chunks) and chunks[end][0] == end_offset:
+                end_offset += chunks[end][1].region_verts.size
+                end += 1
+            if end - start == 1:
+                verts = chunks[start][1].region_verts
             else:
-                verts = self.new_empty_verts()
-            self._temp_data = verts, merged_locations
+                verts = self._get_scratch_verts(end_offset - offset)
+                write_offset = 0
+                for _, chunk in chunks[start:end]:
+                    size = chunk.region_verts.size
+                    verts[write_offset : write_offset + size] = chunk.region_verts
+                    write_offset += size
+            glBufferSubData(
+                GL_ARRAY_BUFFER,
+                offset * RegionVertexType.itemsize,
+                verts.nbytes,
+                verts,
+            )
+            start = end
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def merge(self):
+        """Write the geometry of the chunks added since the last merge into the vertex buffer.
+        Each chunk is written into free space in the buffer so that the existing geometry does not need uploading again.
+        If there is not enough space the whole region is packed into a larger buffer."""
+        self._create_geometry()
+        if self._unmerged_chunks:
+            self._setup()
+            to_write = []
+            for chunk_location in self._unmerged_chunks:
+                chunk = self._chunks[chunk_location]
+                # the geometry of the chunk this replaced is drawn until now
+                self._free_merged_chunk(chunk_location)
+                size = chunk.region_verts.size
+                offset = self._allocate(size)
+                if offset is None:
+                    chunks = self._chunks.copy()
+                    self._load_packed(
+                        *self._pack_chunks(chunks, use_scratch=True),
+                        chunks,
+                        spare_capacity=True,
+                    )
+                    return
+                if size:
+                    to_write.append((offset, chunk))
+                opaque_size = chunk.region_opaque_count
+                self._merged_chunk_locations[chunk_location] = (
+                    offset,
+                    opaque_size,
+                    offset + opaque_size,
+                    size - opaque_size,
+                )
+            self._write_chunks(to_write)
+            self._unmerged_chunks.clear()
+            self._update_draw_ranges()
+
+    def rebuild(self):
+        """Repack the chunk geometry for the region to remove the gaps left by chunks that have been replaced.
+        This can be run from another thread. The result is loaded into opengl on the next draw call.
+        """
+        if self._free_ranges and self._temp_data is None:
+            chunks = self._chunks.copy()
+            self._temp_data = (*self._pack_chunks(chunks), chunks)
 
     def _create_geometry(self):
         """Load the temporary vertex data into opengl."""
         if self._temp_data is not None:
-            self._setup()
-            verts, merged_locations = self._temp_data
+            temp_data = self._temp_data
             self._temp_data = None
-            self.draw_count = int(verts.size // self._vert_len)
-            self._merged_chunk_locations = merged_locations
-
-            self.change_verts(verts)
-            for coord in merged_locations:
-                chunk = self._manual_chunks.pop(coord, None)
-                if chunk is not None:
-                    chunk.unload()
+            self._load_packed(*temp_data)
 
     def unload(self):
         """Unload all opengl data"""
         super().unload()
+        self._vbo_capacity = 0
+        self._vbo_used = 0
+        self._free_ranges = []
+        self._merged_chunk_locations = {}
+        self._unmerged_chunks = set()
+        self._update_draw_ranges()
+        self._temp_data = None
+        self.bounds = numpy.array([self._origin, self._origin])
+        self._has_bounds = False
         for chunk in self._chunks.values():
             chunk.unload()
         self._chunks.clear()
 
-    def draw(self, camera_matrix: TransformationMatrix, cam_cx, cam_cz):
-        self._create_geometry()
-        transformation_matrix = numpy.matmul(camera_matrix, self.region_transform)
-        super().draw(transformation_matrix)
-        for chunk in sorted(
-            self._manual_chunks.values(),
-            key=lambda x: abs(x.cx - cam_cx) + abs(x.cz - cam_cz),
-            reverse=True,
-        ):
-            chunk.draw(transformation_matrix)
+    def _draw_arrays(self):
+        glMultiDrawArrays(
+            self.draw_mode, self._draw_firsts, self._draw_counts, self._draw_counts.size
+        )
+
+    def draw(self, transformation_matrix: TransformationMatrix):
+        """Draw the region.
+
+        :param transformation_matrix: The camera matrix translated to the region origin.
+        """
+        if self._draw_counts.size:
+            # There is only something to draw once merge has been run which does the opengl setup.
+            self._draw(transformation_matrix)
+
+    @staticmethod
+    def draw_regions(regions: List[Tuple["RenderRegion", TransformationMatrix]]):
+        """Draw a number of regions in order.
+        The regions must all be from the same context and resource pack so that they use the same shader and texture.
+        These are bound once for all the regions rather than for each region.
+
+        :param regions: The regions to draw and the camera matrix translated to the origin of each.
+        """
+        # There is only something to draw once merge has been run which does the opengl setup.
+        regions = [
+            (region, transformation_matrix)
+            for region, transformation_matrix in regions
+            if region._draw_counts.size
+        ]
+        if regions:
+            regions[0][0]._bind_draw_state()
+            for region, transformation_matrix in regions:
+                region._draw_bound(transformation_matrix)
+            regions[0][0]._unbind_draw_state()
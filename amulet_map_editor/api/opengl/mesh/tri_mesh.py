@@ -35,6 +35,18 @@ class TriMesh(Drawable, ContextManager):
     """The base class for a triangular face mesh.
     Implements the base logic to set up and unload OpenGL."""
 
+    __slots__ = (
+        "_vao",
+        "_vbo",
+        "_shader",
+        "_transform_location",
+        "_texture_location",
+        "_texture",
+        "verts",
+        "draw_start",
+        "draw_count",
+    )
+
     _vertex_attrs = (
         3,  # vertex attribute pointers
         2,  # texture coords attribute pointers
@@ -153,15 +165,27 @@ class TriMesh(Drawable, ContextManager):
         self._setup()
         self._draw(transformation_matrix)
 
-    def _draw(self, transformation_matrix: numpy.ndarray):
+    def _draw_arrays(self):
+        """Issue the draw call. The program, uniforms, vertex array and texture are already bound."""
+        glDrawArrays(self.draw_mode, self.draw_start, self.draw_count)
+
+    def _bind_draw_state(self):
+        """Bind the shader program and texture used to draw the mesh.
+        Meshes using the same shader and texture can be drawn between one call to this and _unbind_draw_state.
+        """
         glUseProgram(self._shader)
+        glUniform1i(self._texture_location, 0)
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, self._texture)
+
+    def _draw_bound(self, transformation_matrix: numpy.ndarray):
+        """Draw the mesh. The state set up in _bind_draw_state must already be bound."""
         glUniformMatrix4fv(
             self._transform_location,
             1,
             GL_FALSE,
             transformation_matrix.T.astype(numpy.float32),
         )
-        glUniform1i(self._texture_location, 0)
         try:
             glBindVertexArray(self._vao)
         except GLError:  # There seems to be errors randomly when binding the VBO
@@ -170,11 +194,17 @@ class TriMesh(Drawable, ContextManager):
             )
             self.unload()
             self._setup()
+            glUseProgram(self._shader)
             glBindVertexArray(self._vao)
-        glActiveTexture(GL_TEXTURE0)
-        glBindTexture(GL_TEXTURE_2D, self._texture)
 
-        glDrawArrays(self.draw_mode, self.draw_start, self.draw_count)
+        self._draw_arrays()
 
+    @staticmethod
+    def _unbind_draw_state():
         glBindVertexArray(0)
         glUseProgram(0)
+
+    def _draw(self, transformation_matrix: numpy.ndarray):
+        self._bind_draw_state()
+        self._draw_bound(transformation_matrix)
+        self._unbind_draw_state()
@@ -0,0 +1,75 @@
+import math
+import unittest
+import numpy
+
+from amulet_map_editor.api.opengl.matrix import (
+    perspective_matrix,
+    frustum_planes,
+    displacement_matrix,
+    rotation_matrix_xy,
+)
+from amulet_map_editor.api.opengl.mesh.level.region import ChunkManager
+
+
+def in_clip_space(matrix: numpy.ndarray, point) -> bool:
+    """Is the point inside the view volume of the matrix."""
+    x, y, z, w = matrix @ numpy.array([*point, 1.0])
+    return w > 0 and all(-w <= v <= w for v in (x, y, z))
+
+
+def in_planes(planes: numpy.ndarray, point) -> bool:
+    """Is the point on the inside of every plane."""
+    return bool(numpy.all(planes[:, :3] @ numpy.array(point) + planes[:, 3] >= 0))
+
+
+class FrustumTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        # a camera at the origin looking down -z
+        self.matrix = perspective_matrix(math.radians(70), 1.5, 0.1, 1000)
+
+    def test_points(self):
+        planes = frustum_planes(self.matrix)
+        for point in ((0, 0, -10), (1, 1, -5), (0, 0, -999)):
+            self.assertTrue(in_planes(planes, point), f"{point} should be inside")
+        for point in (
+            (0, 0, 10),  # behind the camera
+            (0, 0, -0.01),  # before the near plane
+            (0, 0, -2000),  # past the far plane
+            (1000, 0, -10),  # right of the view
+            (0, -1000, -10),  # below the view
+        ):
+            self.assertFalse(in_planes(planes, point), f"{point} should be outside")
+
+    def test_matches_clip_space(self):
+        rng = numpy.random.default_rng(0)
+        matrix = (
+            self.matrix
+            @ rotation_matrix_xy(0.3, -1.2)
+            @ displacement_matrix(-20, -70, 15)
+        )
+        planes = frustum_planes(matrix)
+        for point in rng.uniform(-500, 500, (2000, 3)):
+            self.assertEqual(
+                in_planes(planes, point), in_clip_space(matrix, point), str(point)
+            )
+
+    def test_regions_in_frustum(self):
+        chunk_manager = ChunkManager("test", None)
+        chunk_manager._region_bounds = numpy.array(
+            [
+                [[-5, -5, -20], [5, 5, -10]],  # inside
+                [[-5, -5, 10], [5, 5, 20]],  # behind the camera
+                [[-5, -5, -20], [5000, 5, -10]],  # straddling the right plane
+                [[-5, -5, -5000], [5, 5, -10]],  # straddling the far plane
+                [[2000, -5, -20], [3000, 5, -10]],  # right of the view
+            ],
+            dtype=numpy.float64,
+        )
+        self.assertEqual(
+            chunk_manager._regions_in_frustum(self.matrix).tolist(),
+            [True, False, True, True, False],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()